@@ -0,0 +1,119 @@
+"""Micro-batching of concurrent verifications into a single LLM call.
+
+Under load, several /verify requests often arrive within a few milliseconds
+of each other. Coalescing them into one request amortizes the network
+round-trip and the system-prompt cost across the batch, at the price of a
+short wait (max_wait_ms) for the first request in each batch.
+"""
+
+import asyncio
+import logging
+import re
+from typing import Optional
+
+from prompt import create_batch_prompt
+from providers import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+# Output budget per batched item — enough for "DENY: <brief reason>".
+TOKENS_PER_ITEM = 64
+
+# One "[i] <verdict>" line of a batched response; other lines (preamble,
+# commentary) are ignored.
+_INDEXED_LINE = re.compile(r"^\s*\[(\d+)\][ \t]*(.*)$", re.MULTILINE)
+
+
+class Batcher:
+    """Collects prompts for one provider and answers them in batches."""
+
+    def __init__(self, provider: LLMProvider, max_batch: int = 8, max_wait_ms: float = 25):
+        self.provider = provider
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def submit(self, prompt: str) -> str:
+        """Queue a prompt and wait for its raw LLM response line."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((prompt, future))
+        return await future
+
+    def close(self) -> None:
+        """Stop collecting; in-flight batches are cancelled."""
+        if self._task is not None:
+            self._task.cancel()
+        for task in self._inflight:
+            task.cancel()
+
+    async def _collect(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            # A plain sleep, not wait_for(queue.get(), ...): before Python 3.12
+            # wait_for can swallow a cancel that races with the get completing,
+            # so close() would leave this loop running.
+            if self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Dispatch without blocking collection of the next batch.
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: list) -> None:
+        prompts = [prompt for prompt, _ in batch]
+        futures = [future for _, future in batch]
+
+        # Single items go through generate_decision (capped output, stream
+        # closed after the decision line), same as unbatched verifications.
+        if len(batch) == 1:
+            results = await asyncio.gather(self.provider.generate_decision(prompts[0]), return_exceptions=True)
+        else:
+            try:
+                raw = await self.provider.generate(
+                    create_batch_prompt(prompts),
+                    max_tokens=TOKENS_PER_ITEM * len(batch),
+                )
+                results = _split_indexed(raw, len(batch))
+            except Exception as e:
+                results = [e] * len(batch)
+
+            if results is None:
+                logger.warning(f"Batched response did not answer items 1-{len(batch)} exactly once, retrying individually")
+                results = await asyncio.gather(
+                    *(self.provider.generate_decision(p) for p in prompts),
+                    return_exceptions=True,
+                )
+
+        for future, result in zip(futures, results):
+            if future.done():  # Caller went away (e.g. client disconnect).
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def _split_indexed(raw: str, expected: int) -> Optional[list[str]]:
+    """Map "[i] verdict" lines to items 1..expected, or None on mismatch.
+
+    A missing, duplicate, out-of-range or empty item is a mismatch: verdicts are
+    never assigned by line position, since a misassigned one would be cached.
+    """
+    verdicts: dict[int, str] = {}
+    for match in _INDEXED_LINE.finditer(raw):
+        index = int(match.group(1))
+        verdict = match.group(2).strip()
+        if index in verdicts or not 1 <= index <= expected or not verdict:
+            return None
+        verdicts[index] = verdict
+    if len(verdicts) != expected:
+        return None
+    return [verdicts[i] for i in range(1, expected + 1)]
@@ -0,0 +1,114 @@
+"""In-memory caches for verification decisions.
+
+Agent workloads repeat the same tool calls constantly (`npm test`, `git push`).
+Caching the LLM's decision turns a network round-trip into a dict lookup.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a fixed TTL (seconds).
+
+    Not thread-safe — intended for use from a single asyncio event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Insert or refresh an entry, evicting the least recently used on overflow.
+
+        `ttl` overrides the cache-wide TTL for this entry.
+        """
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """Nearest-neighbour cache over prompt embeddings for near-duplicate calls.
+
+    `rm -rf build/ dist/` and `rm -rf dist/ build/` ask the same
+    security question; an embedding lookup (~5ms locally) answers it without
+    a remote LLM call. Only ALLOW decisions are stored, and a hit must come
+    from the same tool.
+
+    Requires numpy and sentence-transformers (optional dependencies) — the
+    constructor raises ImportError if they are missing.
+    """
+
+    def __init__(self, maxsize: int = 1024, threshold: float = 0.92, model_name: str = "all-MiniLM-L6-v2"):
+        import numpy as np
+        from sentence_transformers import SentenceTransformer
+
+        self._np = np
+        self._model = SentenceTransformer(model_name)
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+
+        # Normalized embeddings in one contiguous matrix so a lookup is a
+        # single matmul; tools/decisions are parallel lists (ring buffer).
+        dim = self._model.get_sentence_embedding_dimension()
+        self._vectors = np.zeros((maxsize, dim), dtype=np.float32)
+        self._tools: list[Optional[str]] = [None] * maxsize
+        self._decisions: list[Any] = [None] * maxsize
+        self._inserted = 0
+
+    def embed(self, text: str):
+        """Return the normalized embedding for text (CPU-bound; run off the event loop)."""
+        return self._model.encode(text, normalize_embeddings=True).astype(self._np.float32)
+
+    def get(self, tool: str, vector) -> Optional[Any]:
+        """Return the decision of the most similar prior call, if above threshold."""
+        count = min(self._inserted, self.maxsize)
+        if count:
+            np = self._np
+            # Score only same-tool entries, so a closer match from another
+            # tool can't hide one that clears the threshold.
+            same_tool = np.fromiter((t == tool for t in self._tools[:count]), dtype=bool, count=count)
+            sims = np.where(same_tool, self._vectors[:count] @ vector, -np.inf)
+            best = int(sims.argmax())
+            if sims[best] >= self.threshold:
+                self.hits += 1
+                return self._decisions[best]
+
+        self.misses += 1
+        return None
+
+    def set(self, tool: str, vector, decision: Any) -> None:
+        """Store a decision; overwrites the oldest entry once full."""
+        slot = self._inserted % self.maxsize
+        self._vectors[slot] = vector
+        self._tools[slot] = tool
+        self._decisions[slot] = decision
+        self._inserted += 1
@@ -0,0 +1,71 @@
+"""Deterministic allow/deny prefilter for unambiguous shell commands.
+
+Some commands that reach the sidecar are trivially decidable (`npm test`,
+`rm -rf /`). Classifying them locally skips the LLM round-trip entirely;
+anything not clearly matched falls through to the model.
+"""
+
+import re
+from typing import Any, Optional
+
+# Always-safe commands. Only applied to simple commands — anything with pipes,
+# chaining, redirection or substitution (`git push && curl ... | sh`) still
+# goes to the LLM.
+SAFE_PATTERNS = [
+    r'^git (?:push|pull|rebase|commit|status|diff|log)\b',
+    r'^npm (?:test|install|run)\b',
+    r'^docker build\b',
+    r'^make(?: (?:clean|test|all))?$',
+]
+
+# Options that make an otherwise-safe command run another program or write
+# outside the repo (`git fetch --upload-pack=<cmd>`, `git rebase -x <cmd>`,
+# `docker build -o /etc`). A safe command carrying any of them goes to the
+# LLM. Short-option bundles containing x, c or o (`-xc`) count too.
+_EXEC_OPTIONS = re.compile(
+    r'(?:^|\s)(?:'
+    r'--(?:upload-pack|receive-pack|exec|ext-diff|textconv|output|config|template'
+    r'|script-shell|node-options|secret|ssh)\b'
+    r'|-[a-zA-Z]*[xco][a-zA-Z]*(?:[=\s]|$)'
+    r')'
+)
+
+# Unambiguously dangerous anywhere in the command: (pattern, reason).
+DANGER_PATTERNS = [
+    (r'\brm\s+-(?:rf|fr)\s+/(?:\s|\*|$)', "Destroys entire filesystem"),
+    (r'\b(?:cat|less|more|head|tail|tac|nl|cp|base64|xxd|od|strings|grep)\s+(?:[^\s;&|]+\s+)*/etc/shadow\b',
+     "Reads password hashes"),
+    (r'\bnc\s+(?:\S+\s+)*-e\s+/bin/(?:ba)?sh\b', "Reverse shell"),
+    (r'/dev/tcp/', "Reverse shell"),
+    (r'\bmkfs(?:\.\w+)?\s', "Formats a filesystem"),
+    (r'\bdd\s+if=/dev/(?:zero|u?random)\s+of=/dev/', "Overwrites a disk device"),
+    (r'\bchmod\s+[0-7]{0,3}[2367]\s+/etc/', "Makes system files world-writable"),
+    (r'\bchmod\s+[ugoa]*\+s\s+/bin/', "Sets setuid on a system binary"),
+    (r'\b(?:curl|wget)\b[^|;&]*\|\s*(?:sudo(?:\s+-\w+)*\s+)?(?:ba|z)?sh\b', "Pipes a download into a shell"),
+]
+
+# Shell metacharacters that make a command compound.
+_COMPOUND = re.compile(r'[;&|<>`\n]|\$\(')
+
+_SAFE = re.compile("|".join(f"(?:{p})" for p in SAFE_PATTERNS))
+_DANGER = [(re.compile(pattern), reason) for pattern, reason in DANGER_PATTERNS]
+
+
+def classify(command: Any) -> Optional[tuple[str, Optional[str]]]:
+    """Return (decision, reason) for a clear-cut command, or None to ask the LLM.
+
+    `command` comes straight from the webhook params, so anything but a
+    non-empty string (a list, number, dict) is left to the LLM.
+    """
+    if not command or not isinstance(command, str):
+        return None
+
+    command = command.strip()
+    for pattern, reason in _DANGER:
+        if pattern.search(command):
+            return "deny", reason
+
+    if not _COMPOUND.search(command) and not _EXEC_OPTIONS.search(command) and _SAFE.match(command):
+        return "allow", None
+
+    return None
@@ -1,6 +1,8 @@
 """System prompt and prompt templates for rampart-verify"""
 
 import os
+import re
+import functools
 from typing import Optional
 
 DEFAULT_SYSTEM_PROMPT = """You are a security gate for AI agent tool calls. You receive a command an AI agent wants to execute and decide: ALLOW or DENY.
@@ -32,8 +34,13 @@ EXAMPLES:
 DO NOT explain your reasoning beyond the one-line response. DO NOT hedge. Pick one: ALLOW or DENY."""
 
 
+@functools.lru_cache(maxsize=1)
 def get_system_prompt() -> str:
-    """Return the configured system prompt with optional env-based overrides."""
+    """Return the configured system prompt with optional env-based overrides.
+
+    Resolved once and memoized: byte-identical prompts across calls also let
+    OpenAI/Anthropic prompt caching reuse the prefix.
+    """
     override = os.getenv("VERIFY_SYSTEM_PROMPT")
     if override:
         return override
@@ -49,33 +56,57 @@ def get_system_prompt() -> str:
 SYSTEM_PROMPT = get_system_prompt()
 
 
+# Constant prompt scaffolding, built once: tool -> (prefix, param keys tried in order).
+_HEADER = "COMMAND TO REVIEW:\n"
+_CONTEXT = "\n\nTASK CONTEXT: "
+_TOOL_TEMPLATES = {
+    "exec": (f"{_HEADER}Shell command: ", ("command", "command_b64")),
+    "read": (f"{_HEADER}File read: ", ("path", "file_path")),
+    "write": (f"{_HEADER}File write: ", ("path", "file_path")),
+    "fetch": (f"{_HEADER}HTTP request: ", ("url", "targetUrl")),
+    "web_fetch": (f"{_HEADER}HTTP request: ", ("url", "targetUrl")),
+}
+
+# First line of a response that mentions a decision keyword. Models
+# sometimes lead with prose or prefix the verdict ("Decision: ALLOW"), so this
+# is a search, not an anchored match; the line's verdict is what counts.
+DECISION_RE = re.compile(r'^[^\n]*?(?:ALLOW|DENY)[^\n]*', re.IGNORECASE | re.MULTILINE)
+
+
 def create_verification_prompt(tool: str, params: dict, task_context: Optional[str] = None) -> str:
     """Create a verification prompt for the given tool call.
 
-    Secrets are automatically redacted before the prompt is sent to the LLM.
+    params and task_context are embedded as given — callers redact them first
+    (see redact.redact_params / redact_secrets), as server.verify_action does.
     """
-    from redact import redact_params
-
-    # Redact secrets from params before building the prompt.
-    safe_params = redact_params(params)
-
-    # Extract the key info based on tool type.
-    if tool == "exec":
-        command = safe_params.get("command", safe_params.get("command_b64", "unknown"))
-        info = f"Shell command: {command}"
-    elif tool in ("read", "write"):
-        path = safe_params.get("path", safe_params.get("file_path", "unknown"))
-        info = f"File {tool}: {path}"
-    elif tool in ("fetch", "web_fetch"):
-        url = safe_params.get("url", safe_params.get("targetUrl", "unknown"))
-        info = f"HTTP request: {url}"
+    template = _TOOL_TEMPLATES.get(tool)
+    if template is not None:
+        prefix, keys = template
+        value = next((params[key] for key in keys if key in params), "unknown")
+        prompt = f"{prefix}{value}"
     else:
         # Generic — show tool + truncated params
-        info = f"Tool '{tool}': {str(safe_params)[:200]}"
-
-    prompt = f"COMMAND TO REVIEW:\n{info}"
+        prompt = f"{_HEADER}Tool '{tool}': {str(params)[:200]}"
 
     if task_context:
-        prompt += f"\n\nTASK CONTEXT: {task_context}"
+        prompt = f"{prompt}{_CONTEXT}{task_context}"
 
     return prompt
+
+
+def create_batch_prompt(prompts: list[str]) -> str:
+    """Combine several verification prompts into one request.
+
+    The model is asked for one indexed decision line per item ("[i] ALLOW"),
+    so a single LLM call can answer a whole micro-batch and each verdict can
+    be matched to its item by number rather than by position.
+    """
+    n = len(prompts)
+    parts = [
+        f"Review each of the following {n} tool calls independently. "
+        f"Respond with exactly {n} lines, one per item, each starting with the "
+        f"item's number in brackets: \"[i] ALLOW\" or \"[i] DENY: <brief reason>\"."
+    ]
+    for i, prompt in enumerate(prompts, 1):
+        parts.append(f"[{i}]\n{prompt}")
+    return "\n\n".join(parts)
@@ -1,30 +1,157 @@
 """LLM provider abstraction for rampart-verify"""
 
 import os
+import random
+import asyncio
+import functools
 import logging
 import httpx
+import orjson
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
 
-from prompt import get_system_prompt
+from prompt import DECISION_RE, get_system_prompt
 
 logger = logging.getLogger(__name__)
 
 # Timeout for all LLM calls — must fit within Rampart's webhook timeout (default 5s, max 30s).
 REQUEST_TIMEOUT = 10.0
 
-# Retry config for rate limits.
-MAX_RETRIES = 2
+# Retry config for rate limits — exponential backoff with full jitter, so
+# concurrent requests that hit a 429 together don't retry in lockstep.
+# Attempts and waits together are bounded by REQUEST_TIMEOUT (see
+# _retry_generate), so retries stop once Rampart would have given up.
+MAX_RETRIES = 4
 RETRY_DELAY = 1.0
+MAX_BACKOFF = 8.0
+
+# Output cap for verification calls — "DENY: <brief reason>" fits comfortably.
+DECISION_MAX_TOKENS = 32
+
+# Shared HTTP client — reused across verifications so keep-alive connections
+# skip the TCP connect + TLS handshake on every LLM call. HTTP/2 multiplexes
+# concurrent calls to the same provider over one connection (plain-http
+# endpoints such as local Ollama stay on HTTP/1.1).
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            # Fail fast on connect and on waiting for a pooled connection;
+            # the read budget is the one that covers LLM generation.
+            timeout=httpx.Timeout(connect=2.0, read=REQUEST_TIMEOUT, write=5.0, pool=1.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60.0),
+            http2=True,
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Responses whose unread remainder is being drained (see _stream_lines).
+_drains: set = set()
+
+
+async def _stream_lines(url: str, headers: Optional[dict] = None, json: Optional[dict] = None) -> AsyncIterator[str]:
+    """POST json to url and yield the streamed response body line by line.
+
+    Closed before the end (early exit on the decision line), an HTTP/1.1
+    connection can't go back to the pool until the rest of the body is
+    read, and closing it mid-body would discard it. So on HTTP/1.1 the
+    remainder (at most the call's max_tokens) is drained by a background
+    task instead; HTTP/2 just resets the stream.
+    """
+    client = get_client()
+    response = await client.send(client.build_request("POST", url, headers=headers, json=json), stream=True)
+    lines = response.aiter_lines()
+    handed_off = False
+    try:
+        response.raise_for_status()
+        async for line in lines:
+            yield line
+    except GeneratorExit:
+        if response.http_version != "HTTP/2":
+            task = asyncio.create_task(_drain(response, lines))
+            _drains.add(task)
+            task.add_done_callback(_drains.discard)
+            handed_off = True
+        raise
+    finally:
+        if not handed_off:
+            await response.aclose()
+
+
+async def _drain(response: httpx.Response, lines: AsyncIterator[str]) -> None:
+    try:
+        async for _ in lines:
+            pass
+    except Exception:
+        pass  # Connection is discarded instead of pooled; nothing to report.
+    finally:
+        await response.aclose()
 
 
 class LLMProvider(ABC):
     @abstractmethod
+    def stream(self, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        """Yield response text chunks as the model produces them."""
+
+    async def warm(self) -> None:
+        """Open a pooled connection to the provider ahead of the first verification.
+
+        Best-effort: any HTTP status counts (the handshake is what matters)
+        and connection errors are only logged.
+        """
+
+    async def _warm(self, url: str, headers: Optional[dict] = None) -> None:
+        try:
+            await get_client().get(url, headers=headers)
+        except httpx.HTTPError as e:
+            logger.warning(f"Connection warm-up to {url} failed: {e}")
+
     async def generate(self, prompt: str, max_tokens: int = 150) -> str:
-        pass
+        """Return the full response text."""
+        return await self._retry_generate(lambda: self._collect(prompt, max_tokens, stop_at_decision=False))
+
+    async def generate_decision(self, prompt: str, max_tokens: int = DECISION_MAX_TOKENS) -> str:
+        """Return the response, closing the stream once the decision line is complete.
+
+        The decision is always the first line, so anything after it is
+        wasted generation time and billed tokens.
+        """
+        return await self._retry_generate(lambda: self._collect(prompt, max_tokens, stop_at_decision=True))
+
+    async def _collect(self, prompt: str, max_tokens: int, stop_at_decision: bool) -> str:
+        text = ""
+        chunks = self.stream(prompt, max_tokens)
+        try:
+            async for chunk in chunks:
+                text += chunk
+                if stop_at_decision and _decision_complete(text):
+                    break
+        finally:
+            # Stops reading as soon as the decision is in; _stream_lines
+            # decides whether the rest of the body is drained or dropped.
+            await chunks.aclose()
+        return text
 
     async def _retry_generate(self, fn) -> str:
-        """Retry wrapper for rate-limited requests."""
-        import asyncio
+        """Retry wrapper for rate-limited requests.
+
+        Gives up with the last 429 once the next wait would end past
+        REQUEST_TIMEOUT from the first attempt.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + REQUEST_TIMEOUT
         last_err = None
         for attempt in range(MAX_RETRIES + 1):
             try:
@@ -32,8 +159,10 @@ class LLMProvider(ABC):
             except httpx.HTTPStatusError as e:
                 last_err = e
                 if e.response.status_code == 429 and attempt < MAX_RETRIES:
-                    wait = RETRY_DELAY * (attempt + 1)
-                    logger.warning(f"Rate limited (429), retrying in {wait}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                    wait = _backoff(attempt, e.response.headers.get("retry-after"))
+                    if loop.time() + wait > deadline:
+                        raise
+                    logger.warning(f"Rate limited (429), retrying in {wait:.2f}s (attempt {attempt + 1}/{MAX_RETRIES})")
                     await asyncio.sleep(wait)
                     continue
                 raise
@@ -42,6 +171,32 @@ class LLMProvider(ABC):
         raise last_err
 
 
+def _decision_complete(text: str) -> bool:
+    """True once text holds a finished line the parser would take as the decision.
+
+    The parser reads the first line mentioning ALLOW/DENY; once that line is
+    newline-terminated, later tokens can't change the result.
+    """
+    match = DECISION_RE.search(text)
+    return match is not None and match.end() < len(text)
+
+
+def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+    """Seconds to wait before retry `attempt` (0-based).
+
+    Full jitter: uniform in [0, min(MAX_BACKOFF, RETRY_DELAY * 2**attempt)].
+    A numeric Retry-After from the provider raises the floor, capped at
+    MAX_BACKOFF; HTTP-date values are ignored.
+    """
+    wait = random.uniform(0, min(MAX_BACKOFF, RETRY_DELAY * (2 ** attempt)))
+    if retry_after:
+        try:
+            wait = max(wait, min(MAX_BACKOFF, float(retry_after)))
+        except ValueError:
+            pass
+    return wait
+
+
 class OpenAIProvider(LLMProvider):
     """Works with OpenAI and any OpenAI-compatible API (Together, Groq, local vLLM, etc.)"""
 
@@ -51,30 +206,43 @@ class OpenAIProvider(LLMProvider):
         self.base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
+        self.system_prompt = get_system_prompt()
 
-    async def generate(self, prompt: str, max_tokens: int = 150) -> str:
-        async def _call():
-            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": get_system_prompt()},
-                            {"role": "user", "content": prompt},
-                        ],
-                        "temperature": 0.1,
-                        "max_tokens": max_tokens,
-                    },
-                )
-                response.raise_for_status()
-                return response.json()["choices"][0]["message"]["content"]
-
-        return await self._retry_generate(_call)
+    async def warm(self) -> None:
+        await self._warm(f"{self.base_url}/models", {"Authorization": f"Bearer {self.api_key}"})
+
+    async def stream(self, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        lines = _stream_lines(
+            f"{self.base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                "temperature": 0.1,
+                "max_tokens": max_tokens,
+                "stream": True,
+            },
+        )
+        try:
+            # Server-sent events: "data: {...}" lines, terminated by "data: [DONE]".
+            # Read through to the end of the body so the connection is reused.
+            async for line in lines:
+                if not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    continue
+                choices = orjson.loads(data)["choices"]
+                if choices and choices[0]["delta"].get("content"):
+                    yield choices[0]["delta"]["content"]
+        finally:
+            await lines.aclose()
 
 
 class AnthropicProvider(LLMProvider):
@@ -83,49 +251,76 @@ class AnthropicProvider(LLMProvider):
         self.api_key = os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable is required")
+        self.system_prompt = get_system_prompt()
 
-    async def generate(self, prompt: str, max_tokens: int = 150) -> str:
-        async def _call():
-            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": self.api_key,
-                        "anthropic-version": "2023-06-01",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": self.model,
-                        "system": get_system_prompt(),
-                        "max_tokens": max_tokens,
-                        "messages": [{"role": "user", "content": prompt}],
-                    },
-                )
-                response.raise_for_status()
-                return response.json()["content"][0]["text"]
-
-        return await self._retry_generate(_call)
+    async def warm(self) -> None:
+        await self._warm(
+            "https://api.anthropic.com/v1/models",
+            {"x-api-key": self.api_key, "anthropic-version": "2023-06-01"},
+        )
+
+    async def stream(self, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        lines = _stream_lines(
+            "https://api.anthropic.com/v1/messages",
+            headers={
+                "x-api-key": self.api_key,
+                "anthropic-version": "2023-06-01",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": self.model,
+                "system": self.system_prompt,
+                "max_tokens": max_tokens,
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": True,
+            },
+        )
+        try:
+            # Server-sent events; text arrives in content_block_delta events
+            # and the body ends after message_stop.
+            async for line in lines:
+                if not line.startswith("data: "):
+                    continue
+                event = orjson.loads(line[len("data: "):])
+                if event["type"] == "content_block_delta":
+                    yield event["delta"].get("text", "")
+                elif event["type"] == "error":
+                    raise RuntimeError(f"Anthropic stream error: {event['error'].get('message')}")
+        finally:
+            await lines.aclose()
 
 
 class OllamaProvider(LLMProvider):
     def __init__(self, model: str = "qwen2.5-coder:1.5b", url: str = "http://localhost:11434"):
         self.model = model
         self.url = url
+        self.system_prompt = get_system_prompt()
+        # /api/generate takes one prompt string: static system prefix first,
+        # built once, so only the per-call suffix varies.
+        self._prompt_prefix = f"{self.system_prompt}\n\n"
 
-    async def generate(self, prompt: str, max_tokens: int = 150) -> str:
-        full_prompt = f"{get_system_prompt()}\n\n{prompt}"
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            response = await client.post(
-                f"{self.url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": full_prompt,
-                    "stream": False,
-                    "options": {"temperature": 0.1, "num_predict": max_tokens},
-                },
-            )
-            response.raise_for_status()
-            return response.json()["response"]
+    async def warm(self) -> None:
+        await self._warm(f"{self.url}/api/tags")
+
+    async def stream(self, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        full_prompt = self._prompt_prefix + prompt
+        lines = _stream_lines(
+            f"{self.url}/api/generate",
+            json={
+                "model": self.model,
+                "prompt": full_prompt,
+                "stream": True,
+                "options": {"temperature": 0.1, "num_predict": max_tokens},
+            },
+        )
+        try:
+            # Newline-delimited JSON objects, the last one with "done": true.
+            async for line in lines:
+                if not line:
+                    continue
+                yield orjson.loads(line).get("response", "")
+        finally:
+            await lines.aclose()
 
 
 # Recommended models by tier (cheapest first).
@@ -141,21 +336,41 @@ def get_provider(model: str) -> LLMProvider:
 
     Falls through gracefully: if no API key is configured for the requested
     model, falls back to Ollama (local, free) instead of erroring.
+
+    Providers are cached per model and provider-relevant env snapshot, so the
+    hot path reuses one instance instead of rebuilding it on every request.
     """
+    return _cached_provider(
+        model,
+        os.getenv("OPENAI_API_KEY"),
+        os.getenv("OPENAI_BASE_URL"),
+        os.getenv("ANTHROPIC_API_KEY"),
+        os.getenv("OLLAMA_URL", "http://localhost:11434"),
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_provider(
+    model: str,
+    openai_key: Optional[str],
+    openai_base_url: Optional[str],
+    anthropic_key: Optional[str],
+    ollama_url: str,
+) -> LLMProvider:
+    """Build a provider; arguments double as the cache key for get_provider."""
 
     # Anthropic models
     if "claude" in model.lower():
-        if os.getenv("ANTHROPIC_API_KEY"):
+        if anthropic_key:
             return AnthropicProvider(model)
         logger.warning(f"No ANTHROPIC_API_KEY set for model {model}, falling back to Ollama")
 
     # OpenAI / OpenAI-compatible models
     elif "gpt" in model.lower():
-        if os.getenv("OPENAI_API_KEY"):
+        if openai_key:
             return OpenAIProvider(model)
         logger.warning(f"No OPENAI_API_KEY set for model {model}, falling back to Ollama")
 
     # Explicit Ollama model or fallback
-    ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
     fallback_model = model if "gpt" not in model.lower() and "claude" not in model.lower() else "qwen2.5-coder:1.5b"
     return OllamaProvider(fallback_model, ollama_url)
@@ -46,10 +46,43 @@ SECRET_PATTERNS = [
     (r'(-H\s+["\'][^"\']*:\s*)[A-Za-z0-9+/=]{40,}', r'\1[REDACTED_B64]'),
 ]
 
-# Compile patterns once at import time.
+
+# Compile patterns once at import time. Applied one after another: a later
+# pattern must see the earlier patterns' redactions (e.g. the user:pass@host
+# pattern echoes its user span, which may contain an already-redacted key).
 _COMPILED = [(re.compile(pattern), replacement) for pattern, replacement in SECRET_PATTERNS]
 
 
+# Lowercase ASCII substrings, at least one of which must appear for any pattern above
+# to match. Keep in sync with SECRET_PATTERNS — every pattern needs a sentinel
+# here, except the 40+ char hex/base64 ones, which are caught by _LONG_TOKEN.
+_SENTINELS = (
+    "akia", "aws_",                            # AWS
+    "_live_", "_test_",                        # Stripe
+    "sk-",                                     # OpenAI / Anthropic
+    "ghp_", "gho_", "ghu_", "ghs_", "github_pat_",  # GitHub
+    "bearer", "authorization",                 # Auth headers
+    "://",                                     # user:pass@host URLs
+    "api", "secret", "token", "private", "passw", "pwd",  # key=value
+)
+
+# Shortest whitespace-free run the hex/base64 patterns can match.
+_LONG_TOKEN = 40
+
+
+def _may_contain_secret(text: str) -> bool:
+    """Cheap prefilter: False means no pattern in SECRET_PATTERNS can match."""
+    # re.IGNORECASE matches some non-ASCII letters against ASCII ones (e.g.
+    # "ı" ~ "i", "ſ" ~ "s") that no string case mapping reproduces, so
+    # non-ASCII text always gets the full scan.
+    if not text.isascii():
+        return True
+    lowered = text.lower()
+    if any(s in lowered for s in _SENTINELS):
+        return True
+    return any(len(token) >= _LONG_TOKEN for token in text.split())
+
+
 def redact_secrets(text: str) -> str:
     """Replace secret-like patterns in text with redaction placeholders.
 
@@ -60,7 +93,11 @@ def redact_secrets(text: str) -> str:
         return text
 
     # Collapse line continuations before matching (shell `\` at EOL).
-    collapsed = re.sub(r'\\\n\s*', '', text)
+    collapsed = re.sub(r'\\\n\s*', '', text) if "\\\n" in text else text
+
+    # Most commands carry no secret markers at all — skip the regex scan.
+    if not _may_contain_secret(collapsed):
+        return collapsed
 
     result = collapsed
     for pattern, replacement in _COMPILED:
@@ -1,47 +1,117 @@
 """Main FastAPI server for rampart-verify — semantic verification sidecar for Rampart."""
 
 import os
-import json
+import math
+import queue
+import atexit
 import asyncio
 import time
+import hashlib
+import functools
 import logging
-from datetime import datetime, timezone
+import contextlib
+import importlib.util
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+import orjson
 import uvicorn
 
-from providers import get_provider, RECOMMENDED_MODELS
-from prompt import create_verification_prompt
+from providers import get_provider, close_client, RECOMMENDED_MODELS
+from prompt import DECISION_RE, create_verification_prompt
+from cache import TTLCache, SemanticCache
+from batch import Batcher
+from fastpath import classify
+from redact import redact_params, redact_secrets
 
 # --- Logging setup: console + file ---
 LOG_DIR = Path(os.getenv("VERIFY_LOG_DIR", os.path.expanduser("~/.rampart/verify")))
 LOG_DIR.mkdir(parents=True, exist_ok=True, mode=0o700)
 
+# Handlers run on a listener thread; the event loop only enqueues records,
+# so async handlers never block on console or disk writes.
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_listener = QueueListener(
+    _log_queue,
+    logging.StreamHandler(),
+    logging.FileHandler(LOG_DIR / "verify.log"),
+    respect_handler_level=True,
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# The QueueHandler formats records before enqueueing; the listener's handlers
+# then write the preformatted message as-is.
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(LOG_DIR / "verify.log"),
-    ],
+    handlers=[QueueHandler(_log_queue)],
 )
 logger = logging.getLogger(__name__)
 
 # Decision log — append-only JSONL for audit.
 DECISION_LOG = LOG_DIR / "decisions.jsonl"
+_DECISION_LOG_PATH = os.fspath(DECISION_LOG)  # for os.open; the Path is kept for display
+
+# One O_APPEND descriptor for the process lifetime: every write lands at the
+# current end of file, so no lock or reopen is needed, even alongside other
+# processes appending to the same log. Owner-only: entries hold the raw,
+# unredacted request params and task context.
+try:
+    _decision_fd: Optional[int] = os.open(_DECISION_LOG_PATH, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    atexit.register(os.close, _decision_fd)
+except OSError as e:
+    _decision_fd = None
+    logger.error(f"Cannot open decision log {DECISION_LOG}: {e}")
+
+# Entries are queued and written in batches by a background task, so the
+# request path never blocks on disk I/O.
+DECISION_LOG_QUEUE_SIZE = 10000
+DECISION_LOG_BATCH = 100
+DECISION_LOG_FLUSH_INTERVAL = 0.05  # seconds
+_decision_queue: Optional[asyncio.Queue] = None
 
 # Max request body: 1MB — prevent memory exhaustion from oversized payloads.
 MAX_REQUEST_BODY = 1 * 1024 * 1024
 
-app = FastAPI(title="Rampart Verify", description="Semantic verification sidecar for Rampart")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown hooks — warm the provider and its connection, run the
+    decision log writer, release pooled connections on exit."""
+    global _decision_queue
+
+    provider = get_provider(os.getenv("VERIFY_MODEL", "gpt-4o-mini"))
+    # In the background so a slow or unreachable provider doesn't delay startup.
+    warm = asyncio.create_task(provider.warm())
+    _decision_queue = asyncio.Queue(maxsize=DECISION_LOG_QUEUE_SIZE)
+    writer = asyncio.create_task(_decision_log_writer(_decision_queue))
+    yield
+    for task in (warm, writer):
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    _decision_queue = None
+    for batcher in _batchers.values():
+        batcher.close()
+    await close_client()
+
+
+app = FastAPI(
+    title="Rampart Verify",
+    description="Semantic verification sidecar for Rampart",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse
 
 
 @app.middleware("http")
@@ -49,53 +119,117 @@ async def limit_request_body(request: Request, call_next):
     """Reject requests with bodies larger than MAX_REQUEST_BODY."""
     content_length = request.headers.get("content-length")
     if content_length and int(content_length) > MAX_REQUEST_BODY:
-        return JSONResponse(status_code=413, content={"detail": "Request body too large"})
+        return ORJSONResponse(status_code=413, content={"detail": "Request body too large"})
     return await call_next(request)
 
 
-def _parse_rate_limit() -> int:
-    """Parse requests/minute limit from env with safe fallback."""
-    raw = os.getenv("VERIFY_RATE_LIMIT", "60")
+def _parse_positive_int(name: str, default: int) -> int:
+    """Parse a positive integer from env with safe fallback."""
+    raw = os.getenv(name, str(default))
     try:
         value = int(raw)
-        return value if value > 0 else 60
+        return value if value > 0 else default
     except ValueError:
-        logger.warning(f"Invalid VERIFY_RATE_LIMIT={raw!r}, using default 60")
-        return 60
+        logger.warning(f"Invalid {name}={raw!r}, using default {default}")
+        return default
 
 
 class TokenBucketRateLimiter:
-    """Simple in-memory token bucket rate limiter."""
+    """Simple in-memory token bucket rate limiter.
+
+    Tokens are tracked in integer thousandths so the bucket doesn't drift
+    under high QPS. allow() never awaits, so it is atomic on the event loop
+    without a lock.
+    """
+
+    SCALE = 1000
 
     def __init__(self, capacity: int, refill_per_second: float):
-        self.capacity = float(capacity)
+        self.capacity = capacity * self.SCALE
         self.refill_per_second = refill_per_second
-        self.tokens = float(capacity)
-        self.last_refill = time.monotonic()
-        self.lock = asyncio.Lock()
+        self.tokens = self.capacity
+        self._scaled_rate = refill_per_second * self.SCALE
+        # Refill is computed from a fixed origin rather than by advancing a
+        # timestamp per credit, so float rounding can't accumulate: after t
+        # seconds exactly int(t * rate) thousandths have been credited.
+        self._origin = time.monotonic()
+        self._credited = 0
+
+    def _refill(self, now: float) -> None:
+        total = int((now - self._origin) * self._scaled_rate)
+        if total > self._credited:
+            self.tokens += total - self._credited
+            self._credited = total
+        if self.tokens >= self.capacity:
+            self.tokens = self.capacity
+            self._origin = now
+            self._credited = 0
+
+    def allow(self) -> bool:
+        self._refill(time.monotonic())
+        if self.tokens < self.SCALE:
+            return False
+        self.tokens -= self.SCALE
+        return True
+
+    def retry_after(self) -> float:
+        """Seconds until the next whole token is available."""
+        now = time.monotonic()
+        self._refill(now)
+        missing = self.SCALE - self.tokens
+        if missing <= 0:
+            return 0.0
+        return max(0.0, (self._credited + missing) / self._scaled_rate - (now - self._origin))
+
+
+RATE_LIMIT_PER_MINUTE = _parse_positive_int("VERIFY_RATE_LIMIT", 60)
+rate_limiter = TokenBucketRateLimiter(
+    capacity=RATE_LIMIT_PER_MINUTE,
+    refill_per_second=RATE_LIMIT_PER_MINUTE / 60.0,
+)
+
+# Exact-match decision cache, keyed by SHA-256 of (model, redacted prompt).
+# DENYs expire sooner so a stale deny doesn't keep blocking a command after
+# the prompt or policy context changes.
+decision_cache = TTLCache(
+    maxsize=_parse_positive_int("VERIFY_CACHE_SIZE", 4096),
+    ttl=_parse_positive_int("VERIFY_CACHE_TTL", 3600),
+)
+CACHE_DENY_TTL = min(_parse_positive_int("VERIFY_CACHE_DENY_TTL", 300), decision_cache.ttl)
 
-    async def allow(self) -> bool:
-        async with self.lock:
-            now = time.monotonic()
-            elapsed = now - self.last_refill
-            self.last_refill = now
+# Optional semantic tier for near-duplicate ALLOWs — off by default because a
+# similar-looking command is not necessarily an equally safe one.
+semantic_cache: Optional[SemanticCache] = None
+if os.getenv("VERIFY_SEMANTIC_CACHE") == "1":
+    try:
+        semantic_cache = SemanticCache(threshold=float(os.getenv("VERIFY_SEMANTIC_THRESHOLD", "0.92")))
+    except ImportError as e:
+        logger.warning(f"VERIFY_SEMANTIC_CACHE=1 but {e.name} is not installed, semantic cache disabled")
 
-            self.tokens = min(self.capacity, self.tokens + (elapsed * self.refill_per_second))
-            if self.tokens < 1.0:
-                return False
+# Deterministic allow/deny for clear-cut shell commands, skipping the LLM.
+FASTPATH_ENABLED = os.getenv("VERIFY_FASTPATH", "1") != "0"
 
-            self.tokens -= 1.0
-            return True
+# Optional micro-batching of concurrent LLM calls — off by default because the
+# batching window adds latency at low request rates.
+BATCH_ENABLED = os.getenv("VERIFY_BATCH") == "1"
+BATCH_MAX = _parse_positive_int("VERIFY_BATCH_MAX", 8)
+BATCH_WAIT_MS = _parse_positive_int("VERIFY_BATCH_WAIT_MS", 25)
+_batchers: Dict[Any, Batcher] = {}
 
 
-RATE_LIMIT_PER_MINUTE = _parse_rate_limit()
-rate_limiter = TokenBucketRateLimiter(
-    capacity=RATE_LIMIT_PER_MINUTE,
-    refill_per_second=RATE_LIMIT_PER_MINUTE / 60.0,
-)
+def _get_batcher(provider) -> Batcher:
+    """Return the batcher for a (cached) provider instance."""
+    batcher = _batchers.get(provider)
+    if batcher is None:
+        batcher = _batchers[provider] = Batcher(provider, max_batch=BATCH_MAX, max_wait_ms=BATCH_WAIT_MS)
+    return batcher
+
+
+# LLM calls in progress, keyed like decision_cache (see _decide).
+_inflight: Dict[str, asyncio.Task] = {}
+
 
 service_start = time.monotonic()
-metrics_lock = asyncio.Lock()
 total_requests = 0
 total_allows = 0
 total_denies = 0
@@ -104,27 +238,48 @@ total_latency_ms = 0.0
 total_latency_samples = 0
 
 
-async def _record_request_metrics(
+def _record_request_metrics(
     *,
     latency_ms: float,
     decision: Optional[str] = None,
     error: bool = False,
 ) -> None:
-    """Update in-memory metrics counters."""
+    """Update in-memory metrics counters.
+
+    No lock needed: this runs on the single event-loop thread and never awaits.
+    """
     global total_allows, total_denies, total_errors, total_latency_ms, total_latency_samples
 
-    async with metrics_lock:
-        if decision == "allow":
-            total_allows += 1
-        elif decision == "deny":
-            total_denies += 1
-        if error:
-            total_errors += 1
-        total_latency_ms += latency_ms
-        total_latency_samples += 1
+    if decision == "allow":
+        total_allows += 1
+    elif decision == "deny":
+        total_denies += 1
+    if error:
+        total_errors += 1
+    total_latency_ms += latency_ms
+    total_latency_samples += 1
+
+
+# strftime only runs when the second rolls over; within a second just the
+# milliseconds change.
+_iso_second: tuple[int, str] = (-1, "")
+
+
+def _utcnow_iso() -> str:
+    """Current UTC time as ISO 8601 with millisecond precision, e.g. 2026-02-12T20:12:11.042Z."""
+    global _iso_second
+    now = time.time()
+    second = int(now)
+    if _iso_second[0] != second:
+        _iso_second = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+    return f"{_iso_second[1]}.{int(now % 1 * 1000):03d}Z"
 
 
 class WebhookRequest(BaseModel):
+    # Unknown webhook fields are dropped; frozen because the request is read
+    # again after the response is sent (background decision logging).
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     tool: str
     params: Dict[str, Any]
     agent: Optional[str] = None
@@ -141,8 +296,17 @@ class VerificationResponse(BaseModel):
     model: str
 
 
-def log_decision(request: WebhookRequest, response: VerificationResponse, latency_ms: float):
-    """Append decision to JSONL audit log."""
+async def log_decision(
+    request: WebhookRequest,
+    response: VerificationResponse,
+    latency_ms: float,
+    cached: bool = False,
+):
+    """Queue decision for the JSONL audit log (written by _decision_log_writer).
+
+    A coroutine so BackgroundTasks runs it on the event loop: a sync function
+    would run in a worker thread, and asyncio.Queue is not thread-safe.
+    """
     entry = {
         "timestamp": response.timestamp,
         "tool": request.tool,
@@ -154,11 +318,59 @@ def log_decision(request: WebhookRequest, response: VerificationResponse, latenc
         "reason": response.reason,
         "model": response.model,
         "latency_ms": round(latency_ms, 1),
+        "cached": cached,
     }
+    if _decision_queue is None:
+        # Writer not running (app used without its lifespan) — write inline.
+        _write_decisions([entry])
+        return
+
+    try:
+        _decision_queue.put_nowait(entry)
+    except asyncio.QueueFull:
+        logger.error("Decision log queue full, dropping entry")
+
+
+async def _decision_log_writer(queue: asyncio.Queue) -> None:
+    """Drain queued decisions to DECISION_LOG.
+
+    After the first entry arrives, more are coalesced for
+    DECISION_LOG_FLUSH_INTERVAL (skipped once a full batch is already
+    queued), then written in batches of up to DECISION_LOG_BATCH entries,
+    one write() each.
+    """
+    pending: list = []
     try:
-        fd = os.open(str(DECISION_LOG), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
-        with os.fdopen(fd, "a") as f:
-            f.write(json.dumps(entry, default=str) + "\n")
+        while True:
+            pending.append(await queue.get())
+            # A plain sleep, not wait_for(queue.get(), ...): before Python 3.12
+            # wait_for can swallow a cancel that races with the get completing,
+            # leaving shutdown stuck on the next get().
+            if queue.qsize() < DECISION_LOG_BATCH - 1:
+                await asyncio.sleep(DECISION_LOG_FLUSH_INTERVAL)
+            while len(pending) < DECISION_LOG_BATCH and not queue.empty():
+                pending.append(queue.get_nowait())
+            _write_decisions(pending)
+            pending = []
+    finally:
+        # Shutdown — flush collected and still-queued entries before closing.
+        while not queue.empty():
+            pending.append(queue.get_nowait())
+        if pending:
+            _write_decisions(pending)
+
+
+def _write_decisions(entries: list) -> None:
+    if _decision_fd is None:
+        return
+    payload = memoryview(b"".join(
+        orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE) for entry in entries
+    ))
+    try:
+        # write() may be partial (e.g. disk nearly full); keep going until the
+        # whole batch is on disk or an error is raised.
+        while payload:
+            payload = payload[os.write(_decision_fd, payload):]
     except Exception as e:
         logger.error(f"Failed to write decision log: {e}")
 
@@ -182,7 +394,7 @@ async def health_check():
 
     return {
         "status": status,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _utcnow_iso(),
         "model": model,
         "latency_ms": round(latency_ms, 1),
         "log_dir": str(LOG_DIR),
@@ -191,50 +403,57 @@ async def health_check():
 
 
 @app.post("/verify", response_model=VerificationResponse)
-async def verify_action(request: WebhookRequest):
-    """Main verification endpoint — called by Rampart's action:webhook."""
+async def verify_action(request: WebhookRequest, background_tasks: BackgroundTasks):
+    """Main verification endpoint — called by Rampart's action:webhook.
+
+    Returns the response directly (model_dump + orjson) so FastAPI doesn't
+    re-validate and re-serialize it through response_model, which is kept
+    for the OpenAPI schema. The decision is logged after the response is sent.
+    """
     global total_requests
 
     start = time.monotonic()
     model = os.getenv("VERIFY_MODEL", "gpt-4o-mini")
 
-    async with metrics_lock:
-        total_requests += 1
+    total_requests += 1
 
-    allowed = await rate_limiter.allow()
-    if not allowed:
+    if not rate_limiter.allow():
         elapsed = (time.monotonic() - start) * 1000
-        await _record_request_metrics(latency_ms=elapsed)
+        _record_request_metrics(latency_ms=elapsed)
         raise HTTPException(
             status_code=429,
             detail=f"Rate limit exceeded: max {RATE_LIMIT_PER_MINUTE} requests per minute",
+            headers={"Retry-After": str(max(1, math.ceil(rate_limiter.retry_after())))},
         )
 
-    logger.info(f"Verifying {request.tool}: {_summarize_params(request.params)}")
+    # Redact once up front — the LLM only needs intent, never secret values,
+    # and placeholders are shorter than the tokens they replace.
+    safe_params = redact_params(request.params)
+    safe_context = redact_secrets(request.task_context) if request.task_context else None
 
-    try:
-        provider = get_provider(model)
-        prompt = create_verification_prompt(
-            request.tool,
-            request.params,
-            request.task_context,
-        )
+    logger.info(f"Verifying {request.tool}: {_summarize_params(safe_params)}")
 
-        raw_response = await provider.generate(prompt)
-        decision, reason = parse_llm_response(raw_response)
+    try:
+        fast = classify(safe_params.get("command")) if FASTPATH_ENABLED and request.tool == "exec" else None
+        if fast is not None:
+            decision, reason = fast
+            model = source = "fastpath"
+        else:
+            decision, reason, cached = await _decide(request.tool, safe_params, safe_context, model)
+            source = "cache" if cached else "llm"
 
         result = VerificationResponse(
             decision=decision,
             reason=reason,
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=_utcnow_iso(),
             model=model,
         )
 
         elapsed = (time.monotonic() - start) * 1000
-        log_decision(request, result, elapsed)
-        await _record_request_metrics(latency_ms=elapsed, decision=decision)
-        logger.info(f"Decision: {decision} ({elapsed:.0f}ms)" + (f" — {reason}" if reason else ""))
-        return result
+        background_tasks.add_task(log_decision, request, result, elapsed, cached=source == "cache")
+        _record_request_metrics(latency_ms=elapsed, decision=decision)
+        logger.info(f"Decision: {decision} ({elapsed:.0f}ms, {source})" + (f" — {reason}" if reason else ""))
+        return ORJSONResponse(result.model_dump())
 
     except Exception as e:
         elapsed = (time.monotonic() - start) * 1000
@@ -244,51 +463,118 @@ async def verify_action(request: WebhookRequest):
         result = VerificationResponse(
             decision="allow",
             reason=f"Verification unavailable, allowing by default",
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=_utcnow_iso(),
             model=model,
         )
-        log_decision(request, result, elapsed)
-        await _record_request_metrics(latency_ms=elapsed, decision="allow", error=True)
-        return result
+        background_tasks.add_task(log_decision, request, result, elapsed)
+        _record_request_metrics(latency_ms=elapsed, decision="allow", error=True)
+        return ORJSONResponse(result.model_dump())
+
+
+async def _decide(
+    tool: str,
+    params: Dict[str, Any],
+    task_context: Optional[str],
+    model: str,
+) -> tuple[str, Optional[str], bool]:
+    """Resolve a decision from the caches or the LLM. Returns (decision, reason, cached).
+
+    params and task_context must already be redacted.
+    """
+    prompt = create_verification_prompt(tool, params, task_context)
+
+    cache_key = hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+    cached = decision_cache.get(cache_key)
+    vector = None
+    if cached is None and semantic_cache is not None:
+        vector = await asyncio.to_thread(semantic_cache.embed, prompt)
+        cached = semantic_cache.get(tool, vector)
+    if cached is not None:
+        return (*cached, True)
+
+    # Single-flight: identical concurrent verifications share one LLM call.
+    # Callers await through shield() so one client disconnecting doesn't
+    # cancel the call for the others.
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_ask_llm(tool, prompt, model, cache_key, vector))
+        _inflight[cache_key] = task
+        task.add_done_callback(functools.partial(_inflight_done, cache_key))
+    return (*await asyncio.shield(task), False)
+
+
+async def _ask_llm(
+    tool: str,
+    prompt: str,
+    model: str,
+    cache_key: str,
+    vector,
+) -> tuple[str, Optional[str]]:
+    """Get a decision for prompt from the LLM and cache it if clear-cut."""
+    provider = get_provider(model)
+    if BATCH_ENABLED:
+        raw_response = await _get_batcher(provider).submit(prompt)
+    else:
+        raw_response = await provider.generate_decision(prompt)
+
+    parsed = _parse_decision(raw_response)
+    if parsed is None:
+        return parse_llm_response(raw_response)
+
+    # Only cache clear decisions — never the fail-open fallback.
+    decision_cache.set(cache_key, parsed, ttl=CACHE_DENY_TTL if parsed[0] == "deny" else None)
+    if vector is not None and parsed[0] == "allow":
+        semantic_cache.set(tool, vector, parsed)
+    return parsed
+
+
+def _inflight_done(cache_key: str, task: asyncio.Task) -> None:
+    _inflight.pop(cache_key, None)
+    if not task.cancelled():
+        # Mark the exception retrieved even if every caller went away.
+        task.exception()
 
 
 def parse_llm_response(response: str) -> tuple[str, Optional[str]]:
     """Parse LLM response to extract decision and reason."""
-    response = response.strip()
-
-    # Handle multi-line responses — take first meaningful line.
-    for line in response.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-
-        upper = line.upper()
-        if upper == "ALLOW":
-            return "allow", None
-        if upper.startswith("DENY"):
-            reason = line.split(":", 1)[1].strip() if ":" in line else "Action denied by security review"
-            return "deny", reason
-        # Some models prefix with "Decision: ALLOW" etc.
-        if "ALLOW" in upper and "DENY" not in upper:
-            return "allow", None
-        if "DENY" in upper:
-            reason = line.split(":", 1)[1].strip() if ":" in line else "Action denied by security review"
-            return "deny", reason
+    parsed = _parse_decision(response)
+    if parsed is not None:
+        return parsed
 
     # Unclear response — fail open.
-    logger.warning(f"Unclear LLM response, allowing: {response[:100]}")
+    logger.warning(f"Unclear LLM response, allowing: {response.strip()[:100]}")
     return "allow", None
 
 
+def _parse_decision(response: str) -> Optional[tuple[str, Optional[str]]]:
+    """Extract (decision, reason) from an LLM response, or None if unclear."""
+    # Common case: a bare verdict.
+    if response.strip() == "ALLOW":
+        return "allow", None
+
+    match = DECISION_RE.search(response)
+    if match is None:
+        return None
+
+    # DENY anywhere on the line wins, even alongside ALLOW.
+    line = match.group()
+    if "DENY" not in line.upper():
+        return "allow", None
+    _, sep, reason = line.partition(":")
+    return "deny", reason.strip() if sep else "Action denied by security review"
+
+
+# Params worth showing in the log line, most specific first.
+_SUMMARY_KEYS = ("command", "path", "file_path", "url")
+
+
 def _summarize_params(params: dict) -> str:
     """Short summary of params for logging (no secrets)."""
-    if "command" in params:
-        cmd = str(params["command"])
-        return cmd[:80] + ("..." if len(cmd) > 80 else "")
-    if "path" in params or "file_path" in params:
-        return str(params.get("path", params.get("file_path", "")))[:80]
-    if "url" in params:
-        return str(params["url"])[:80]
+    for key in _SUMMARY_KEYS:
+        value = params.get(key)
+        if value is not None:
+            text = value if isinstance(value, str) else str(value)
+            return text[:80] + ("..." if len(text) > 80 else "")
     return str(params)[:80]
 
 
@@ -308,17 +594,20 @@ async def root():
 async def metrics():
     """Simple in-process metrics endpoint."""
     now = time.monotonic()
-    async with metrics_lock:
-        avg_latency_ms = (total_latency_ms / total_latency_samples) if total_latency_samples else 0.0
-        return {
-            "total_requests": total_requests,
-            "total_allows": total_allows,
-            "total_denies": total_denies,
-            "total_errors": total_errors,
-            "avg_latency_ms": round(avg_latency_ms, 1),
-            "model": os.getenv("VERIFY_MODEL", "gpt-4o-mini"),
-            "uptime_seconds": round(now - service_start, 1),
-        }
+    avg_latency_ms = (total_latency_ms / total_latency_samples) if total_latency_samples else 0.0
+    return {
+        "total_requests": total_requests,
+        "total_allows": total_allows,
+        "total_denies": total_denies,
+        "total_errors": total_errors,
+        "cache_hits": decision_cache.hits,
+        "cache_misses": decision_cache.misses,
+        "cache_size": len(decision_cache),
+        **({"semantic_cache_hits": semantic_cache.hits} if semantic_cache is not None else {}),
+        "avg_latency_ms": round(avg_latency_ms, 1),
+        "model": os.getenv("VERIFY_MODEL", "gpt-4o-mini"),
+        "uptime_seconds": round(now - service_start, 1),
+    }
 
 
 def main():
@@ -330,7 +619,24 @@ def main():
     logger.info(f"Model: {os.getenv('VERIFY_MODEL', 'gpt-4o-mini')}")
     logger.info(f"Decision log: {DECISION_LOG}")
 
-    uvicorn.run(app, host=host, port=port)
+    # uvloop + httptools come with uvicorn[standard]; fall back to the stdlib
+    # loop and h11 where they are unavailable (e.g. uvloop on Windows).
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logger.info(f"Event loop: {loop}, HTTP parser: {http}")
+
+    # Access log off — decisions.jsonl already records every verification.
+    # interface is pinned so uvicorn skips ASGI-version autodetection.
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        loop=loop,
+        http=http,
+        interface="asgi3",
+        log_level="info",
+        access_log=False,
+    )
 
 
 if __name__ == "__main__":
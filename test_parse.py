@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Tests for parsing the LLM's decision line."""
+
+import os
+import tempfile
+
+# server opens its log files on import.
+os.environ.setdefault("VERIFY_LOG_DIR", tempfile.mkdtemp())
+
+from server import _parse_decision, parse_llm_response
+
+
+def test_bare_allow():
+    assert parse_llm_response("ALLOW") == ("allow", None)
+    assert parse_llm_response("  allow\n") == ("allow", None)
+
+
+def test_deny_with_reason():
+    assert parse_llm_response("DENY: Reverse shell") == ("deny", "Reverse shell")
+
+
+def test_deny_without_colon():
+    assert parse_llm_response("DENY") == ("deny", "Action denied by security review")
+
+
+def test_prefixed_verdict():
+    """Reason is everything after the first colon on the line."""
+    assert parse_llm_response("Decision: ALLOW") == ("allow", None)
+    assert parse_llm_response("Decision: DENY: x") == ("deny", "DENY: x")
+
+
+def test_prose_before_verdict():
+    assert parse_llm_response("Let me check this command.\n\nDENY: Reads password hashes") == (
+        "deny", "Reads password hashes")
+
+
+def test_first_verdict_line_wins():
+    assert parse_llm_response("ALLOW\nDENY: second thoughts") == ("allow", None)
+
+
+def test_deny_anywhere_on_line_wins():
+    assert parse_llm_response("ALLOW unless piped to a shell, then DENY")[0] == "deny"
+
+
+def test_unclear_fails_open():
+    for response in ["I'm not sure.", "", "\n\n"]:
+        assert _parse_decision(response) is None, response
+        assert parse_llm_response(response) == ("allow", None), response
+
+
+if __name__ == "__main__":
+    import sys
+    tests = [v for k, v in globals().items() if k.startswith("test_")]
+    passed = 0
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"  ✅ {t.__name__}")
+            passed += 1
+        except Exception as e:
+            print(f"  ❌ {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(1 if failed else 0)
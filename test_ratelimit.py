@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Tests for the token bucket rate limiter."""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+# server opens its log files on import.
+os.environ.setdefault("VERIFY_LOG_DIR", tempfile.mkdtemp())
+
+from server import TokenBucketRateLimiter
+
+
+@contextmanager
+def fake_clock(start: float = 1000.0):
+    """Replace time.monotonic with a settable clock; yields a one-item list holding now."""
+    now = [start]
+    real = time.monotonic
+    time.monotonic = lambda: now[0]
+    try:
+        yield now
+    finally:
+        time.monotonic = real
+
+
+def test_exhaust_bucket():
+    with fake_clock():
+        limiter = TokenBucketRateLimiter(capacity=3, refill_per_second=1.0)
+        assert [limiter.allow() for _ in range(4)] == [True, True, True, False]
+
+
+def test_partial_refill_carries_over():
+    """Two half-token refills add up to one token rather than being dropped."""
+    with fake_clock() as now:
+        limiter = TokenBucketRateLimiter(capacity=1, refill_per_second=1.0)
+        assert limiter.allow()
+        now[0] += 0.5
+        assert not limiter.allow()
+        now[0] += 0.5
+        assert limiter.allow()
+        assert not limiter.allow()
+
+
+def test_fractional_refill_does_not_drift():
+    """Many small refills credit the same total as one large one."""
+    with fake_clock() as now:
+        limiter = TokenBucketRateLimiter(capacity=10, refill_per_second=0.7)
+        for _ in range(10):
+            assert limiter.allow()
+        # 80 steps of 1/8s: each earns 87.5 thousandths, so half a thousandth
+        # is carried every step; 10s at 0.7/s must come to exactly 7 tokens.
+        for _ in range(80):
+            now[0] += 0.125
+            limiter.retry_after()  # refills as a side effect
+        assert limiter.tokens == 7 * TokenBucketRateLimiter.SCALE
+
+
+def test_refill_capped_at_capacity():
+    with fake_clock() as now:
+        limiter = TokenBucketRateLimiter(capacity=2, refill_per_second=1.0)
+        assert limiter.allow()
+        now[0] += 3600
+        assert [limiter.allow() for _ in range(3)] == [True, True, False]
+
+
+def test_retry_after():
+    with fake_clock() as now:
+        limiter = TokenBucketRateLimiter(capacity=1, refill_per_second=0.5)
+        assert limiter.retry_after() == 0.0
+        assert limiter.allow()
+        assert abs(limiter.retry_after() - 2.0) < 1e-9
+        now[0] += 1.5
+        assert abs(limiter.retry_after() - 0.5) < 1e-9
+        now[0] += 0.5
+        assert limiter.retry_after() == 0.0
+        assert limiter.allow()
+
+
+if __name__ == "__main__":
+    import sys
+    tests = [v for k, v in globals().items() if k.startswith("test_")]
+    passed = 0
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"  ✅ {t.__name__}")
+            passed += 1
+        except Exception as e:
+            print(f"  ❌ {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(1 if failed else 0)
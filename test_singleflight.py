@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Tests for single-flight deduplication of concurrent verifications."""
+
+import asyncio
+import os
+import tempfile
+from contextlib import contextmanager
+
+# server opens its log files on import.
+os.environ.setdefault("VERIFY_LOG_DIR", tempfile.mkdtemp())
+
+import server
+
+
+class SlowProvider:
+    """Answers ALLOW after a short delay and counts the calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_decision(self, prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return "ALLOW"
+
+
+@contextmanager
+def fake_provider():
+    """Route server's LLM calls to a SlowProvider."""
+    provider = SlowProvider()
+    real = server.get_provider
+    server.get_provider = lambda model: provider
+    try:
+        yield provider
+    finally:
+        server.get_provider = real
+
+
+def _decide(command: str):
+    return server._decide("exec", {"command": command}, None, "test-model")
+
+
+def test_concurrent_requests_share_one_call():
+    async def run():
+        return await asyncio.gather(*(_decide("ls -la /srv/flight") for _ in range(10)))
+
+    with fake_provider() as provider:
+        results = asyncio.run(run())
+    assert provider.calls == 1
+    assert all(r[:2] == ("allow", None) for r in results)
+    assert not server._inflight
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    async def run():
+        waiters = [asyncio.ensure_future(_decide("ls -la /srv/cancel")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        results = await asyncio.gather(*waiters[1:])
+        return waiters[0], results
+
+    with fake_provider() as provider:
+        cancelled, results = asyncio.run(run())
+    assert cancelled.cancelled()
+    assert provider.calls == 1
+    assert all(r[:2] == ("allow", None) for r in results)
+    assert not server._inflight
+
+
+if __name__ == "__main__":
+    import sys
+    tests = [v for k, v in globals().items() if k.startswith("test_")]
+    passed = 0
+    failed = 0
+    for t in tests:
+        try:
+            t()
+            print(f"  ✅ {t.__name__}")
+            passed += 1
+        except Exception as e:
+            print(f"  ❌ {t.__name__}: {e}")
+            failed += 1
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(1 if failed else 0)